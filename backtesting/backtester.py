@@ -1,6 +1,18 @@
 import pandas as pd
 
 
+class BacktestState:
+    """
+    Strategy-independent state carried between chunks of a streaming backtest.
+    """
+
+    def __init__(self):
+        self.entry_price = None
+        self.total_profit = 0
+        self.last_position = None
+        self.tail = None  # last `lookback_period` bars already seen, used as lookback for the next chunk
+
+
 class Backtester:
     def __init__(self, strategy, lot_size, stop_loss):
         self.strategy = strategy
@@ -10,58 +22,119 @@ class Backtester:
     def calculate_profit(self, entry_price, exit_price, position):
         return position * (exit_price - entry_price) * self.lot_size
 
-    def run(self, data):
-        signals = []
-        positions = []
-        profits = [None] * len(data)  # Initialize profits with None values
-        entry_price = None
-        total_profit = 0
+    def _process(self, data, state):
+        """
+        Evaluates every bar of `data` from `lookback_period` onwards, updating `state`.
 
+        Returns:
+            tuple: Lists of signals, positions and profits for the evaluated bars.
+        """
         if 'Close' in data.columns or 'close' in data.columns:
             close_label = 'Close' if 'Close' in data.columns else 'close'
         else:
             raise KeyError("DataFrame does not contain column 'Close' or 'close'")
 
+        closes = data[close_label].to_numpy()
+        signals = []
+        positions = []
+        profits = []
+
         for i in range(self.strategy.lookback_period, len(data)):
             lookback_data = data[i - self.strategy.lookback_period:i]
             signal = self.strategy.generate_signal(lookback_data)
-            close_price = data[close_label].iloc[i]
+            close_price = closes[i]
+            profit = None
 
             if signal is not None:
                 signals.append(signal)
                 if signal == 'BUY':
-                    if positions[-1] != 'LONG':
-                        entry_price = close_price
+                    if state.last_position != 'LONG':
+                        state.entry_price = close_price
                 elif signal == 'SELL':
-                    if positions[-1] != 'SHORT':
-                        entry_price = close_price
+                    if state.last_position != 'SHORT':
+                        state.entry_price = close_price
                 elif signal == 'CLOSE' and self.strategy.position is None:
-                    profit = self.calculate_profit(entry_price, close_price,
+                    profit = self.calculate_profit(state.entry_price, close_price,
                                                    1 if self.strategy.position == 'LONG' else -1)
                     print(f"Resultado da ultima operacao foi {profit}")
-                    profits[i] = profit  # Update profits at the current index
-                    total_profit += profit
+                    state.total_profit += profit
 
             else:
                 signals.append(None)
 
             positions.append(self.strategy.position)
+            state.last_position = self.strategy.position
 
-            if self.strategy.position is not None and abs(entry_price - close_price) >= self.stop_loss:
-                # close_price = data['Close'][-1]
-                profit = self.calculate_profit(entry_price, close_price, 1 if self.strategy.position == 'LONG' else -1)
-                profits[i] = profit  # Update profits at the last index
-                total_profit += profit
-                signal = 'CLOSE'
+            if self.strategy.position is not None and abs(state.entry_price - close_price) >= self.stop_loss:
+                profit = self.calculate_profit(state.entry_price, close_price,
+                                               1 if self.strategy.position == 'LONG' else -1)
+                state.total_profit += profit
 
+            profits.append(profit)
+
+        return signals, positions, profits
+
+    def _result_frame(self, signals, positions, profits, index):
         result_df = pd.DataFrame({
             'Sinal': signals,
             'Posição': positions,
-            'Lucro/Prejuízo': profits[self.strategy.lookback_period:]},
-            index=data.index[self.strategy.lookback_period:]
+            'Lucro/Prejuízo': profits},
+            index=index
         )
+        return result_df.fillna({'Lucro/Prejuízo': 0.00})
+
+    def run(self, data):
+        state = BacktestState()
+        signals, positions, profits = self._process(data, state)
 
-        result_df = result_df.fillna({'Lucro/Prejuízo': 0.00})
-        total_profit_label = f"Resultado total: {total_profit}"
+        result_df = self._result_frame(signals, positions, profits, data.index[self.strategy.lookback_period:])
+        total_profit_label = f"Resultado total: {state.total_profit}"
         return result_df, total_profit_label
 
+    def process_chunk(self, chunk, state):
+        """
+        Evaluates one chunk of bars, using the tail of the previous chunk as lookback.
+
+        Args:
+            chunk (pd.DataFrame): The next bars, in time order.
+            state (BacktestState): The state left by the previous chunk; updated in place.
+
+        Returns:
+            pd.DataFrame: Results for the bars of `chunk` that were evaluated.
+        """
+        lookback = self.strategy.lookback_period
+
+        if state.tail is not None and len(state.tail) > 0:
+            # consecutive date ranges from the provider may share their boundary bar
+            chunk = chunk[chunk.index > state.tail.index[-1]]
+            data = pd.concat([state.tail, chunk])
+        else:
+            data = chunk
+
+        # bars before `lookback` were either evaluated in a previous chunk or are warm-up
+        signals, positions, profits = self._process(data, state)
+        state.tail = data.iloc[-lookback:] if lookback > 0 else data.iloc[:0]
+
+        return self._result_frame(signals, positions, profits, data.index[lookback:])
+
+    def run_chunked(self, chunks, state=None):
+        """
+        Streams a backtest over an iterable of bar chunks, keeping only one chunk in memory.
+
+        Strategy and position state are carried across chunk boundaries, so the results are the same
+        as `run` over the concatenated data.
+
+        Args:
+            chunks (iterable): DataFrames in time order, e.g. from `iter_historical_data` or
+                `pd.read_csv(path, index_col=0, parse_dates=True, chunksize=n)`.
+            state (BacktestState): State to resume from. A new one is created if None.
+
+        Yields:
+            tuple: The results DataFrame of each chunk and the running total profit.
+        """
+        if state is None:
+            state = BacktestState()
+
+        for chunk in chunks:
+            result_df = self.process_chunk(chunk, state)
+            yield result_df, state.total_profit
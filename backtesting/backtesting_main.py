@@ -1,8 +1,9 @@
 import sys
 
 sys.path.append('f:\\Repos\\Algotrading.Integration')
-from data_source.data_providers import data_provider_factory
-from backtesting.backtester import Backtester
+from data_source.data_providers import data_provider_factory, iter_historical_data
+from backtesting.backtester import Backtester, BacktestState
+from backtesting.result_store import ResultStore
 from strategies.mean_reversion import MeanReversionStrategy
 
 sys.path.append('f:\\Repos\\Algotrading.Integration')
@@ -39,8 +40,34 @@ def run_backtesting():
     # Analyze the backtesting results
     print(backtest_results[1])
 
-    # Perform further analysis, visualization, and evaluation of the results
-    backtest_results[0].to_csv(f"resultado_{symbol}_inicio_{start_date}_fim_{end_date}.csv", index=True)
+    # Store the results in the run catalog; query them later with ResultStore.query(symbol=..., ...)
+    params = {'lookback_period': 20, 'entry_threshold': 2, 'exit_threshold': 1, 'lot_size': 1.0, 'stop_loss': 100}
+    result_store = ResultStore('resultados')
+    run_id = result_store.save(backtest_results[0], symbol, start_date, end_date, params)
+    print(f"Resultados salvos na execucao {run_id}")
+
+
+def run_backtesting_chunked():
+    # Streaming version for multi-year M1 history: only one chunk of bars is kept in memory
+    data_provider = data_provider_factory('metatrader')
+
+    symbol = 'WINM24'
+    start_date = '2014-01-01'
+    end_date = '2024-05-04'
+
+    strategy = MeanReversionStrategy(symbol=symbol, lookback_period=20, entry_threshold=2, exit_threshold=1,
+                                     lot_size=1.0)
+    backtester = Backtester(strategy, lot_size=1.0, stop_loss=100)
+
+    params = {'lookback_period': 20, 'entry_threshold': 2, 'exit_threshold': 1, 'lot_size': 1.0, 'stop_loss': 100}
+    chunks = iter_historical_data(data_provider, symbol, start_date, end_date, chunk_days=30)
+    state = BacktestState()
+    chunk_results = (results for results, _ in backtester.run_chunked(chunks, state))
+
+    # each chunk is encoded to int8/float32 columns as soon as it is produced
+    result_store = ResultStore('resultados')
+    run_id = result_store.save(chunk_results, symbol, start_date, end_date, params)
+    print(f"Resultado total: {state.total_profit} (execucao {run_id})")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from backtesting.backtester import BacktestState
+from backtesting.result_store import decode_results, encode_results, get_code_version
+
+
+def data_fingerprint(data):
+    """
+    Returns a hash of a DataFrame's index and values.
+    """
+    return hashlib.sha1(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes()).hexdigest()
+
+
+class IncrementalBacktestCache:
+    """
+    Memoizes backtests partition by partition (e.g. one partition per day).
+
+    The cache key of a partition chains the symbol, parameters, code version and the fingerprints of
+    every partition up to it, so a cached entry is only reused when all the data before it is unchanged.
+    Each partition has a compressed results file; a checkpoint of the backtester (strategy included) and
+    BacktestState is only written every `checkpoint_every` partitions and after the last one. A run finds
+    the longest cached prefix by file existence, unpickles only the latest checkpoint in it and computes
+    from there, so a re-run only computes new bars and a sweep with one more parameter value only
+    computes that value.
+    """
+
+    def __init__(self, cache_dir, code_version=None, checkpoint_every=20):
+        self.cache_dir = cache_dir
+        self.code_version = get_code_version() if code_version is None else code_version
+        self.checkpoint_every = checkpoint_every
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _results_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def _checkpoint_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.ckpt")
+
+    def _chain_keys(self, symbol, params, fingerprints):
+        key = hashlib.sha1(json.dumps([symbol, params, self.code_version], sort_keys=True, default=str)
+                           .encode()).hexdigest()
+        keys = []
+        for fingerprint in fingerprints:
+            key = hashlib.sha1(f"{key}{fingerprint}".encode()).hexdigest()
+            keys.append(key)
+        return keys
+
+    @staticmethod
+    def _load_results(path):
+        # a missing or unreadable entry (e.g. left by a killed run) is a cache miss
+        try:
+            with np.load(path) as entry:
+                return {name: entry[name] for name in entry.files}
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Entrada de cache invalida {path}, recalculando: {str(e)}")
+            return None
+
+    @staticmethod
+    def _load_checkpoint(path):
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Checkpoint invalido {path}, ignorado: {str(e)}")
+            return None
+
+    @staticmethod
+    def _save_results(path, encoded):
+        # write to a temporary file and rename, so readers never see a partially written entry
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            np.savez_compressed(f, **encoded)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _save_checkpoint(path, backtester, state):
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            pickle.dump((backtester, state), f)
+        os.replace(temp_path, path)
+
+    def _resume(self, cached_keys):
+        # the latest readable checkpoint in the cached prefix; earlier ones are never unpickled
+        for i in range(len(cached_keys) - 1, -1, -1):
+            path = self._checkpoint_path(cached_keys[i])
+            if os.path.exists(path):
+                checkpoint = self._load_checkpoint(path)
+                if checkpoint is not None:
+                    backtester, state = checkpoint
+                    return i + 1, backtester, state
+        return 0, None, None
+
+    def run(self, backtester_factory, params, symbol, partitions, fingerprints=None, load_results=True):
+        """
+        Runs a backtest over partitions, reusing every cached partition.
+
+        Args:
+            backtester_factory (callable): Builds a fresh Backtester (with its strategy) from `params`.
+            params (dict): The strategy and backtester parameters.
+            symbol (str): The ticker symbol of the instrument.
+            partitions (list): DataFrames in time order, e.g. one per day.
+            fingerprints (list): Precomputed `data_fingerprint` of each partition, to share between runs.
+            load_results (bool): If False, cached results are not read and no DataFrame is built, e.g. when
+                only the total profit of a sweep is needed.
+
+        Returns:
+            tuple: The results DataFrame in Backtester format (None if `load_results` is False), the total
+            profit and the number of partitions that had to be computed.
+        """
+        if fingerprints is None:
+            fingerprints = [data_fingerprint(data) for data in partitions]
+
+        keys = self._chain_keys(symbol, params, fingerprints)
+        cached = 0
+        while cached < len(keys) and os.path.exists(self._results_path(keys[cached])):
+            cached += 1
+
+        if cached < len(keys):
+            start, backtester, state = self._resume(keys[:cached])
+        else:
+            start, backtester, state = cached, None, None
+
+        # results of the partitions that are not recomputed, or only the last one for its total profit
+        if load_results:
+            needed = range(start)
+        elif 0 < start == len(keys):
+            needed = [start - 1]
+        else:
+            needed = []
+        results = []
+        for i in needed:
+            entry = self._load_results(self._results_path(keys[i]))
+            if entry is None:
+                # recompute from the start and rewrite this partition and the ones after it
+                cached, start, backtester, state = i, 0, None, None
+                results = []
+                break
+            results.append(entry)
+        total_profit = float(results[-1]['total_profit']) if results else 0.0
+
+        if start < len(keys) and backtester is None:
+            backtester, state = backtester_factory(params), BacktestState()
+
+        computed = 0
+        for i in range(start, len(keys)):
+            encoded = encode_results(backtester.process_chunk(partitions[i], state))
+            encoded['total_profit'] = np.float64(state.total_profit)
+            if i >= cached:
+                self._save_results(self._results_path(keys[i]), encoded)
+            if (i + 1) % self.checkpoint_every == 0 or i == len(keys) - 1:
+                checkpoint_path = self._checkpoint_path(keys[i])
+                if not os.path.exists(checkpoint_path):
+                    self._save_checkpoint(checkpoint_path, backtester, state)
+            if load_results:
+                results.append(encoded)
+            total_profit = state.total_profit
+            computed += 1
+
+        result_df = self._results_frame(results) if load_results else None
+        return result_df, total_profit, computed
+
+    def run_sweep(self, backtester_factory, param_grid, symbol, partitions, load_results=True):
+        """
+        Runs `run` for every parameter set, fingerprinting the partitions only once.
+
+        Returns:
+            list: One (params, results DataFrame or None, total profit, computed partitions) tuple per
+            parameter set.
+        """
+        fingerprints = [data_fingerprint(data) for data in partitions]
+        sweep = []
+        for params in param_grid:
+            result_df, total_profit, computed = self.run(backtester_factory, params, symbol, partitions, fingerprints,
+                                                         load_results=load_results)
+            sweep.append((params, result_df, total_profit, computed))
+        return sweep
+
+    @staticmethod
+    def _results_frame(results):
+        columns = {name: np.concatenate([encoded[name] for encoded in results]) if results else
+                   np.empty(0, dtype=np.int64)
+                   for name in ('time', 'signal', 'position', 'pnl')}
+
+        decoded = decode_results({'signal': columns['signal'], 'position': columns['position']})
+        return pd.DataFrame({
+            'Sinal': decoded['signal'],
+            'Posição': decoded['position'],
+            'Lucro/Prejuízo': columns['pnl'].astype(np.float64)},
+            index=pd.to_datetime(columns['time'])
+        )
@@ -0,0 +1,306 @@
+import hashlib
+import json
+import os
+import subprocess
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+SIGNAL_CODES = {None: 0, 'BUY': 1, 'SELL': -1, 'CLOSE': 2}
+POSITION_CODES = {None: 0, 'LONG': 1, 'SHORT': -1}
+RESULT_COLUMNS = ('signal', 'position', 'pnl')
+CATALOG_COLUMNS = ['run_id', 'symbol', 'start_date', 'end_date', 'params', 'code_version', 'rows', 'total_profit',
+                   'index_id', 'created_at']
+
+
+def _source_hash(root_dir):
+    digest = hashlib.sha1()
+    for dir_path, dir_names, file_names in os.walk(root_dir):
+        dir_names[:] = sorted(name for name in dir_names if not name.startswith('.'))
+        for name in sorted(file_names):
+            if name.endswith('.py'):
+                path = os.path.join(dir_path, name)
+                digest.update(os.path.relpath(path, root_dir).encode())
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def get_code_version():
+    """
+    Returns the short git commit hash of the working tree.
+
+    Uncommitted changes add a '-dirty-' suffix with a hash of the diff and of the untracked Python files,
+    so results of edited code never share a version with the commit. Outside a git checkout, the version
+    is a hash of the project's Python sources.
+    """
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def git(*args):
+        return subprocess.check_output(['git', *args], cwd=root_dir, stderr=subprocess.DEVNULL)
+
+    try:
+        version = git('rev-parse', '--short', 'HEAD').decode().strip()
+        digest = hashlib.sha1(git('diff', 'HEAD', '--', '*.py'))
+        untracked = git('ls-files', '--others', '--exclude-standard', '--', '*.py').decode().split()
+    except Exception:
+        return f"src-{_source_hash(root_dir)}"
+
+    for path in sorted(untracked):
+        digest.update(path.encode())
+        with open(os.path.join(root_dir, path), 'rb') as f:
+            digest.update(f.read())
+    if digest.digest() != hashlib.sha1().digest():
+        version = f"{version}-dirty-{digest.hexdigest()[:8]}"
+    return version
+
+
+def _encode(values, codes):
+    # missing labels (None/NaN) map to code 0
+    return pd.Series(values).map(codes).fillna(0).to_numpy(dtype=np.int8)
+
+
+def _label_table(codes):
+    # labels indexed by `code - min_code`, so a whole column is decoded with one fancy index
+    min_code = min(codes.values())
+    table = np.empty(max(codes.values()) - min_code + 1, dtype=object)
+    for label, code in codes.items():
+        table[code - min_code] = label
+    return table, min_code
+
+
+_SIGNAL_LABELS = _label_table(SIGNAL_CODES)
+_POSITION_LABELS = _label_table(POSITION_CODES)
+
+
+def _decode(values, labels):
+    table, min_code = labels
+    return table[np.asarray(values, dtype=np.int64) - min_code]
+
+
+def _time_ns(index):
+    """
+    Converts a datetime index to int64 nanoseconds since epoch, whatever the unit of the index.
+
+    Timezone-aware indexes are converted to UTC.
+    """
+    return pd.DatetimeIndex(index).values.astype('datetime64[ns]').view(np.int64)
+
+
+def encode_results(result_df):
+    """
+    Converts a Backtester results DataFrame into compact columns.
+
+    Args:
+        result_df (pd.DataFrame): DataFrame with 'Sinal', 'Posição' and 'Lucro/Prejuízo' columns.
+
+    Returns:
+        dict: int64 'time' (ns since epoch, see `_time_ns`), int8 'signal' and 'position' codes and
+        float32 'pnl'.
+    """
+    return {
+        'time': _time_ns(result_df.index),
+        'signal': _encode(result_df['Sinal'], SIGNAL_CODES),
+        'position': _encode(result_df['Posição'], POSITION_CODES),
+        'pnl': result_df['Lucro/Prejuízo'].to_numpy(dtype=np.float32),
+    }
+
+
+def decode_results(columns):
+    """
+    Converts compact columns back to the labels used by the Backtester.
+    """
+    decoded = {}
+    for name, values in columns.items():
+        if name == 'signal':
+            decoded[name] = _decode(values, _SIGNAL_LABELS)
+        elif name == 'position':
+            decoded[name] = _decode(values, _POSITION_LABELS)
+        else:
+            decoded[name] = values
+    return decoded
+
+
+class ResultStore:
+    """
+    Columnar store of backtest results with a catalog indexed by run metadata.
+
+    Each run is a compressed .npz file with one array per column plus a small .json file with its
+    metadata. The time index (int64 ns since epoch) is stored once per distinct index under `indexes/`,
+    named by its content hash, so every parameter set of a sweep over the same data shares it. The catalog is built from the metadata files when it is read, so parallel sweep workers
+    never rewrite a shared file. Runs with the same symbol, date range, parameters and code version
+    share a run_id, so repeating a sweep overwrites its previous results instead of adding new files.
+    """
+
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+        os.makedirs(os.path.join(root_dir, 'runs'), exist_ok=True)
+        os.makedirs(os.path.join(root_dir, 'indexes'), exist_ok=True)
+
+    def _run_path(self, run_id):
+        return os.path.join(self.root_dir, 'runs', f"{run_id}.npz")
+
+    def _metadata_path(self, run_id):
+        return os.path.join(self.root_dir, 'runs', f"{run_id}.json")
+
+    def _index_path(self, index_id):
+        return os.path.join(self.root_dir, 'indexes', f"{index_id}.npy")
+
+    def _save_index(self, time):
+        index_id = hashlib.sha1(time.tobytes()).hexdigest()[:16]
+        index_path = self._index_path(index_id)
+        if not os.path.exists(index_path):
+            temp_path = f"{index_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                np.save(f, time)
+            os.replace(temp_path, index_path)
+        return index_id
+
+    @staticmethod
+    def make_run_id(symbol, start_date, end_date, params, code_version):
+        key = json.dumps([symbol, start_date, end_date, params, code_version], sort_keys=True, default=str)
+        return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+    def save(self, results, symbol, start_date, end_date, params, total_profit=None, code_version=None):
+        """
+        Stores the results of one backtest run.
+
+        Args:
+            results (pd.DataFrame or iterable): The results DataFrame of `Backtester.run`, or the result
+                chunks of `Backtester.run_chunked`, which are encoded one at a time.
+            symbol (str): The ticker symbol of the instrument.
+            start_date (str): The start date of the backtest (YYYY-MM-DD).
+            end_date (str): The end date of the backtest (YYYY-MM-DD).
+            params (dict): The strategy and backtester parameters.
+            total_profit (float): The total profit of the run. Defaults to the sum of the pnl column.
+            code_version (str): The code version. Defaults to the current git commit.
+
+        Returns:
+            str: The run_id.
+        """
+        if code_version is None:
+            code_version = get_code_version()
+
+        chunks = [results] if isinstance(results, pd.DataFrame) else results
+        encoded = [encode_results(chunk) for chunk in chunks]
+        columns = {name: np.concatenate([chunk[name] for chunk in encoded]) if encoded else
+                   np.empty(0, dtype=np.float32 if name == 'pnl' else np.int64 if name == 'time' else np.int8)
+                   for name in ('time',) + RESULT_COLUMNS}
+
+        if total_profit is None:
+            total_profit = float(columns['pnl'].sum(dtype=np.float64))
+
+        run_id = self.make_run_id(symbol, start_date, end_date, params, code_version)
+        # write to temporary files and rename, so readers never see a partially written run
+        index_id = self._save_index(columns['time'])
+        run_path = self._run_path(run_id)
+        temp_path = f"{run_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            np.savez_compressed(f, **{name: columns[name] for name in RESULT_COLUMNS})
+        os.replace(temp_path, run_path)
+
+        metadata = {
+            'run_id': run_id,
+            'symbol': symbol,
+            'start_date': start_date,
+            'end_date': end_date,
+            'params': json.dumps(params, sort_keys=True, default=str),
+            'code_version': code_version,
+            'rows': len(columns['time']),
+            'total_profit': total_profit,
+            'index_id': index_id,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        metadata_path = self._metadata_path(run_id)
+        temp_path = f"{metadata_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(metadata, f)
+        os.replace(temp_path, metadata_path)
+
+        return run_id
+
+    def catalog(self, **filters):
+        """
+        Lists the stored runs.
+
+        Args:
+            **filters: Equality filters on catalog columns (symbol, start_date, end_date, code_version)
+                or on strategy parameters by name (e.g., entry_threshold=2).
+
+        Returns:
+            pd.DataFrame: One row per matching run.
+        """
+        runs_dir = os.path.join(self.root_dir, 'runs')
+        entries = []
+        for name in sorted(os.listdir(runs_dir)):
+            if name.endswith('.json'):
+                with open(os.path.join(runs_dir, name)) as f:
+                    entries.append(json.load(f))
+
+        catalog = pd.DataFrame(entries, columns=CATALOG_COLUMNS)
+        if not filters:
+            return catalog
+
+        params = catalog['params'].map(json.loads)
+        mask = pd.Series(True, index=catalog.index)
+        for name, value in filters.items():
+            if name in catalog.columns:
+                mask &= catalog[name] == value
+            else:
+                mask &= params.map(lambda p: p.get(name) == value)
+        return catalog[mask]
+
+    def load(self, run_ids, columns=RESULT_COLUMNS, decode=True):
+        """
+        Loads the requested columns of the given runs. Only those columns are decompressed.
+
+        Args:
+            run_ids (str or list): One or more run ids.
+            columns (tuple): Any of 'signal', 'position' and 'pnl'.
+            decode (bool): If True, signal and position codes are converted back to their labels.
+
+        Returns:
+            pd.DataFrame: The results indexed by time, with a 'run_id' column.
+        """
+        if isinstance(run_ids, str):
+            run_ids = [run_ids]
+
+        frames = []
+        indexes = {}
+        for run_id in run_ids:
+            with open(self._metadata_path(run_id)) as f:
+                index_id = json.load(f).get('index_id')
+            with np.load(self._run_path(run_id)) as run:
+                data = {name: run[name] for name in columns}
+                if index_id is None:
+                    # runs saved before the shared indexes keep their time column in the .npz
+                    indexes[run_id] = pd.to_datetime(run['time'])
+                    index_id = run_id
+            if index_id not in indexes:
+                indexes[index_id] = pd.to_datetime(np.load(self._index_path(index_id)))
+            index = indexes[index_id]
+            if decode:
+                data = decode_results(data)
+            frame = pd.DataFrame(data, index=index)
+            frame.insert(0, 'run_id', run_id)
+            frames.append(frame)
+
+        if not frames:
+            return pd.DataFrame(columns=['run_id'] + list(columns))
+        return pd.concat(frames)
+
+    def query(self, columns=RESULT_COLUMNS, decode=True, **filters):
+        """
+        Loads the requested columns of every run matching the filters (see `catalog`).
+        """
+        return self.load(list(self.catalog(**filters)['run_id']), columns=columns, decode=decode)
+
+    def delete(self, run_id):
+        """
+        Removes a run and its catalog entry. Time indexes are shared between runs and are kept.
+        """
+        for path in (self._metadata_path(run_id), self._run_path(run_id)):
+            if os.path.exists(path):
+                os.remove(path)
@@ -1,10 +1,21 @@
-import pandas as pd
-from pytz import timezone
-import yfinance as yf
-import MetaTrader5 as mt5
+import importlib
+import time
 
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import datetime, timedelta
+from importlib.metadata import entry_points
+
+# Providers live in their own modules and are imported only when first requested, so processes that
+# use a single provider (or none, like backtest workers reading from disk) skip yfinance/MetaTrader5.
+ENTRY_POINT_GROUP = 'algotrading.data_providers'
+
+_providers = {
+    'yahoo': 'data_source.yahoo_provider:YahooFinanceDataProvider',
+    'metatrader': 'data_source.metatrader_provider:MetaTraderDataProvider',
+}
+
+# seconds spent importing each provider module, filled on first use
+provider_load_times = {}
 
 
 class DataProviderBase(ABC):
@@ -17,48 +28,6 @@ class DataProviderBase(ABC):
         pass
 
 
-class YahooFinanceDataProvider(DataProviderBase):
-    def __init__(self, api_key=None):
-        self.api_key = api_key
-
-    def get_historical_data(self, symbol, start_date, end_date, interval='1d'):
-        """
-        Retrieves historical price data for a given symbol and date range.
-
-        Args:
-            symbol (str): The ticker symbol of the instrument.
-            start_date (str): The start date of the historical data (YYYY-MM-DD).
-            end_date (str): The end date of the historical data (YYYY-MM-DD).
-            interval (str): The interval of the historical data (e.g., '1d', '1h', '1m').
-
-        Returns:
-            pd.DataFrame: A DataFrame containing the historical price data.
-        """
-        try:
-            data = yf.download(symbol, start=start_date, end=end_date, interval=interval)
-            return data
-        except Exception as e:
-            print(f"Error retrieving historical data for {symbol}: {str(e)}")
-            return None
-
-    def get_realtime_data(self, symbol):
-        """
-        Retrieves real-time price data for a given symbol.
-
-        Args:
-            symbol (str): The ticker symbol of the instrument.
-
-        Returns:
-            float: The current price of the instrument.
-        """
-        try:
-            data = yf.download(symbol, period='1d', interval='1m')
-            return data['Close'][-1]
-        except Exception as e:
-            print(f"Error retrieving real-time data for {symbol}: {str(e)}")
-            return None
-
-
 # class AlphaVantageDataProvider(DataProviderBase):
 #     def __init__(self, api_key):
 #         self.api_key = api_key
@@ -83,167 +52,101 @@ class YahooFinanceDataProvider(DataProviderBase):
 #             print(f"Error retrieving real-time data from Alpha Vantage for {symbol}: {str(e)}")
 #             return None
 
-class MetaTraderDataProvider(DataProviderBase):
-    def __init__(self):
-        self.connected = False
-
-    def connect(self):
-        """
-        Connects to the MetaTrader 5 terminal.
-
-        Returns:
-            bool: True if the connection was successful, False otherwise.
-        """
-        if not self.connected:
-            self.connected = mt5.initialize()
-            return self.connected
-        return True
-
-    def disconnect(self):
-        """
-        Disconnects from the MetaTrader 5 terminal.
-        """
-        if self.connected:
-            mt5.shutdown()
-            self.connected = False
-
-    def get_ticks_from_start(self, symbol: str, start_date: str, end_date: str, flags=mt5.COPY_TICKS_ALL):
-        """
-        Retrieves ticks for a given symbol and date range.
-
-        Args:
-            symbol (str): The ticker symbol of the instrument.
-            start_date (str): The start date of the data (YYYY-MM-DD).
-            end_date (str): The end date of the data (YYYY-MM-DD).
-            flags (int): Type of requested data (mt5.COPY_TICKS_ALL, mt5.COPY_TICKS_INFO).
-
-        Returns:
-            Array of CopyTicks* structures or None in case of failure.
-        """
-        if not mt5.terminal_info():
-            print("Terminal is not connected, trying to connect...")
-            try:
-                self.connect()
-            except Exception as e:
-                print("Error: Not connected")
-                return None
-
-        ticks = mt5.copy_ticks_range(symbol, start_date, end_date, flags)
-
-        if ticks is None:
-            print('No ticks obtained')
-            return ticks
-        else:
-            print('Ticks obtained', len(ticks))
-
-        # create DataFrame out of the obtained data
-        ticks_frame = pd.DataFrame(ticks)
-        # convert time in seconds into the datetime format
-        ticks_frame['time'] = pd.to_datetime(ticks_frame['time'], unit='s')
-
-        # display data
-        print("\nDisplay dataframe with ticks")
-        print(ticks_frame.head(10))
-        return ticks_frame
-
-    def get_historical_data(self, symbol, start_date, end_date, interval=mt5.TIMEFRAME_M1):
-        """
-        Retrieves historical price data for a given symbol and date range.
-
-        Args:
-            symbol (str): The ticker symbol of the instrument.
-            start_date (str): The start date of the historical data (YYYY-MM-DD).
-            end_date (str): The end date of the historical data (YYYY-MM-DD).
-            interval (int): The timeframe of the historical data (e.g., mt5.TIMEFRAME_M1, mt5.TIMEFRAME_H1).
-
-        Returns:
-            pd.DataFrame: A DataFrame containing the historical price data.
-        """
-        pd.set_option('display.max_columns', None)
-        pd.set_option('display.width', None)
-
-        if not self.connected:
-            try:
-                self.connect()
-            except Exception as e:
-                print("Error: Not connected to MetaTrader 5 terminal.")
-                return None
-
-        # create 'datetime' objects in UTC time zone to avoid the implementation of a local time zone offset
-        try:
-            data = mt5.copy_rates_range(symbol, interval, datetime.strptime(start_date, "%Y-%m-%d"),
-                                        datetime.strptime(end_date, "%Y-%m-%d"))
-            df = pd.DataFrame(data)
-            df['time'] = pd.to_datetime(df['time'], unit='s')
-            df.set_index('time', inplace=True)
-            return df
-        except Exception as e:
-            print(f"Error retrieving historical data for {symbol}: {str(e)}")
-            return None
-
-    def get_previous_candles(self, symbol, timeframe, count=5):
-        """
-                Fetches OHLC data for the previous N last candles.
-
-                Args:
-                    symbol (str): The ticker symbol of the instrument.
-                    timeframe (int): The timeframe to retrieve data for (e.g., mt5.TIMEFRAME_M15 for 15-minute bars).
-                    count (int) : The number of candles to retrieve.
-
-                Returns
-                    pandas.DataFrame: A DataFrame containing the OHLC data.
-                """
-
-        pd.set_option('display.max_columns', None)
-        pd.set_option('display.width', 2500)
-        if not self.connected:
-            try:
-                self.connect()
-            except Exception as e:
-                print("Erro: Falha ao conectar ao terminal MetaTrader 5.")
-                return None
-
-        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, count)
-        if rates is None:
-            print("Erro: Não foi possível obter dados OHLC.")
-            return None
-        else:
-            df = pd.DataFrame(rates)
-            df['time'] = pd.to_datetime(df['time'], unit='s')
-            df.set_index('time', inplace=True)
 
-        return df
+def register_provider(name, provider):
+    """
+    Registers a data provider under a name.
 
-    def get_realtime_data(self, symbol):
-        """
-        Retrieves real-time price data for a given symbol.
-
-        Args:
-            symbol (str): The ticker symbol of the instrument.
-
-        Returns:
-            float: The current price of the instrument.
-        """
-        if not self.connected:
-            print("Error: Not connected to MetaTrader 5 terminal.")
-            return None
-
-        try:
-            rates = mt5.symbol_info_tick(symbol)
-            # print(f"{symbol} - last: {rates.last}, bid: {rates.bid}, ask: {rates.ask}")
-            return rates
-        except Exception as e:
-            print(f"Error retrieving real-time data for {symbol}: {str(e)}")
-            return None
-
-
-def data_provider_factory(provider_name, api_key=None):
-    if provider_name == 'yahoo':
-        return YahooFinanceDataProvider()
-    elif provider_name == 'metatrader':
-        return MetaTraderDataProvider()
-    else:
-        raise ValueError(f"Unsupported data provider: {provider_name}")
+    Third-party packages can also expose providers through the 'algotrading.data_providers'
+    entry point group, which is only scanned when an unknown name is requested.
+
+    Args:
+        name (str): The name used with `data_provider_factory`.
+        provider (type or str): The provider class, or a 'module:ClassName' path imported on first use.
+    """
+    _providers[name] = provider
+
+
+def available_providers():
+    """
+    Returns the names of the registered providers, including entry point plugins.
+    """
+    names = set(_providers)
+    names.update(ep.name for ep in entry_points(group=ENTRY_POINT_GROUP))
+    return sorted(names)
+
+
+def get_provider_class(provider_name):
+    """
+    Resolves a provider name to its class, importing its module on first use.
+
+    Args:
+        provider_name (str): The registered provider name.
+
+    Returns:
+        type: The provider class.
+    """
+    provider = _providers.get(provider_name)
+
+    if provider is None:
+        for ep in entry_points(group=ENTRY_POINT_GROUP):
+            if ep.name == provider_name:
+                provider = ep.value
+                break
+        else:
+            raise ValueError(f"Unsupported data provider: {provider_name}")
+
+    if isinstance(provider, str):
+        module_name, _, class_name = provider.partition(':')
+        start = time.perf_counter()
+        provider = getattr(importlib.import_module(module_name), class_name)
+        provider_load_times[provider_name] = time.perf_counter() - start
+        _providers[provider_name] = provider
+
+    return provider
+
+
+def iter_historical_data(data_provider, symbol, start_date, end_date, chunk_days=30, **kwargs):
+    """
+    Retrieves historical price data in consecutive date ranges, one DataFrame at a time.
+
+    Args:
+        data_provider (DataProviderBase): The provider to pull the data from.
+        symbol (str): The ticker symbol of the instrument.
+        start_date (str): The start date of the historical data (YYYY-MM-DD).
+        end_date (str): The end date of the historical data (YYYY-MM-DD).
+        chunk_days (int): The number of days requested per chunk.
+        **kwargs: Extra arguments forwarded to `get_historical_data` (e.g., interval).
+
+    Yields:
+        pd.DataFrame: The historical price data of each date range. Empty ranges are skipped.
+    """
+    chunk_start = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+
+    while chunk_start < end:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days), end)
+        data = data_provider.get_historical_data(symbol, chunk_start.strftime("%Y-%m-%d"),
+                                                 chunk_end.strftime("%Y-%m-%d"), **kwargs)
+        if data is not None and len(data) > 0:
+            yield data
+        chunk_start = chunk_end
+
+
+def data_provider_factory(provider_name, api_key=None, **kwargs):
+    provider_class = get_provider_class(provider_name)
+    if api_key is not None:
+        kwargs['api_key'] = api_key
+    return provider_class(**kwargs)
+
+
+def __getattr__(name):
+    # keeps `from data_source.data_providers import MetaTraderDataProvider` working without eager imports
+    for provider_name, provider in list(_providers.items()):
+        provider_class_name = provider.partition(':')[2] if isinstance(provider, str) else provider.__name__
+        if provider_class_name == name:
+            return get_provider_class(provider_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Usage example
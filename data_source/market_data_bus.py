@@ -0,0 +1,267 @@
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from data_source.tick_store import TICK_DTYPE
+
+
+# Same layout as the structured array returned by mt5.copy_rates_from_pos / mt5.copy_rates_range
+BAR_DTYPE = np.dtype([
+    ('time', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('tick_volume', '<u8'),
+    ('spread', '<i4'),
+    ('real_volume', '<u8'),
+])
+
+_HEADER_SIZE = 64  # int64 write count and capacity, padded to a cache line
+
+
+class SharedRing:
+    """
+    Single-writer ring buffer of structured records in shared memory.
+
+    Every record is written twice, at `i` and `i + capacity`, so the last `n` records are always a
+    contiguous slice. Readers get NumPy views straight into the shared block, without copying. A
+    view is only valid until the writer laps it, i.e. after `capacity` newer records.
+    """
+
+    def __init__(self, name, dtype, capacity=None):
+        """
+        Creates a ring when `capacity` is given, otherwise attaches to an existing ring by name.
+        """
+        self.dtype = np.dtype(dtype)
+        if capacity is not None:
+            self.shm = shared_memory.SharedMemory(name=name, create=True,
+                                                  size=_HEADER_SIZE + 2 * capacity * self.dtype.itemsize)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self._header = np.ndarray((2,), dtype=np.int64, buffer=self.shm.buf)
+        if capacity is not None:
+            self._header[:] = (0, capacity)
+        self.capacity = int(self._header[1])
+        self._records = np.ndarray((2 * self.capacity,), dtype=self.dtype, buffer=self.shm.buf,
+                                   offset=_HEADER_SIZE)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def count(self):
+        """
+        Total number of records written since the ring was created.
+        """
+        return int(self._header[0])
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def write(self, records):
+        count = self.count
+        for record in np.asarray(records).astype(self.dtype, copy=False):
+            position = count % self.capacity
+            self._records[position] = record
+            self._records[position + self.capacity] = record
+            count += 1
+        # publish the new count only after the records are in place
+        self._header[0] = count
+
+    def latest(self, count, end=None):
+        """
+        Returns a view of the last `count` records written before sequence number `end` (default: now).
+        """
+        end = self.count if end is None else end
+        count = min(count, end, self.capacity)
+        if count == 0:
+            return self._records[:0]
+        stop = (end - 1) % self.capacity + 1 + self.capacity
+        return self._records[stop - count:stop]
+
+    def read_since(self, sequence):
+        """
+        Returns a view of the records written after `sequence` and the new sequence number.
+
+        If the reader fell more than `capacity` records behind, the oldest ones are skipped.
+        """
+        end = self.count
+        if end - sequence > self.capacity:
+            print(f"Aviso: leitor do buffer {self.name} atrasado, {end - sequence - self.capacity} registros perdidos.")
+        return self.latest(end - sequence, end), end
+
+    def close(self):
+        self._header = None
+        self._records = None
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+
+def _execute_intent(intent, execution_handler):
+    signal = intent['signal']
+    if signal == 'BUY':
+        execution_handler.market_buy_order(intent['symbol'], intent['lot_size'])
+    elif signal == 'SELL':
+        execution_handler.market_sell_order(intent['symbol'], intent['lot_size'])
+    elif signal == 'CLOSE':
+        # a positive volume closes a long position with a sell, a negative one closes a short with a buy
+        if intent['closing'] == 'LONG':
+            execution_handler.close_position(None, intent['symbol'], intent['lot_size'])
+        elif intent['closing'] == 'SHORT':
+            execution_handler.close_position(None, intent['symbol'], -intent['lot_size'])
+
+
+def run_market_data_publisher(symbols, bar_rings, tick_rings, order_queue, stop_event, timeframe,
+                              poll_interval=1.0, history=100, risk_limits=None):
+    """
+    Owns the MetaTrader 5 connection: publishes bars and ticks to shared rings and sends order intents.
+
+    Meant to run in its own process. Only closed bars are published; the ring of each symbol is seeded
+    with `history` bars so strategy workers can fill their lookback right away. Later polls ask for every
+    bar since the last one published, so a late or failed poll is caught up instead of leaving a gap.
+    Ticks follow the same pattern: every tick since the last one published is copied from the terminal,
+    starting at the tick of the first poll. Ticks sharing the last published millisecond are told apart
+    by how many of them were already published.
+
+    Args:
+        symbols (list): The ticker symbols to publish.
+        bar_rings (dict): Symbol to bar SharedRing name.
+        tick_rings (dict): Symbol to tick SharedRing name.
+        order_queue (multiprocessing.Queue): Order intents sent by the strategy workers.
+        stop_event (multiprocessing.Event): Set to stop publishing.
+        timeframe (int): The bar timeframe (e.g., mt5.TIMEFRAME_M1).
+        poll_interval (float): Seconds between terminal polls.
+        history (int): The number of closed bars published at startup.
+        risk_limits (dict): PreTradeRiskEngine arguments. Orders are sent unchecked if None.
+    """
+    from data_source.data_providers import data_provider_factory
+    from execution.meta_trader_handler import MetaTraderExecutionHandler
+
+    data_provider = data_provider_factory('metatrader')
+    data_provider.connect()
+    execution_handler = MetaTraderExecutionHandler()
+    if risk_limits is not None:
+        from risk_management.pre_trade import PreTradeRiskEngine, RiskCheckedExecutionHandler
+        from risk_management.risk_manager import RiskManagement
+        risk_manager = RiskManagement()
+        risk_engine = PreTradeRiskEngine(**risk_limits)
+        execution_handler = RiskCheckedExecutionHandler(execution_handler, risk_engine)
+
+    bars = {symbol: SharedRing(bar_rings[symbol], BAR_DTYPE) for symbol in symbols}
+    ticks = {symbol: SharedRing(tick_rings[symbol], TICK_DTYPE) for symbol in symbols}
+    last_bar_time = {symbol: -1 for symbol in symbols}
+    last_tick_time = {symbol: -1 for symbol in symbols}
+    # number of ticks already published with time_msc == last_tick_time
+    last_tick_count = {symbol: 0 for symbol in symbols}
+
+    try:
+        while not stop_event.is_set():
+            for symbol in symbols:
+                if last_bar_time[symbol] < 0:
+                    rates = data_provider.get_previous_rates(symbol, timeframe, history + 1)
+                else:
+                    rates = data_provider.get_rates_since(symbol, timeframe, last_bar_time[symbol] + 1)
+                if rates is None:
+                    print(f"Aviso: barras de {symbol} nao obtidas, nova tentativa na proxima consulta.")
+                elif len(rates) > 1:
+                    closed = rates[:-1]  # the last bar is still forming
+                    closed = closed[closed['time'] > last_bar_time[symbol]]
+                    if len(closed) > 0:
+                        bars[symbol].write(closed)
+                        last_bar_time[symbol] = int(closed['time'][-1])
+
+                if last_tick_time[symbol] < 0:
+                    tick = data_provider.get_realtime_data(symbol)
+                    if tick is None:
+                        continue
+                    last_tick_time[symbol] = tick.time_msc
+                new_ticks = data_provider.get_ticks_since(symbol, last_tick_time[symbol], ticks[symbol].capacity)
+                if new_ticks is None:
+                    print(f"Aviso: ticks de {symbol} nao obtidos, nova tentativa na proxima consulta.")
+                    continue
+                new_ticks = new_ticks[new_ticks['time_msc'] >= last_tick_time[symbol]]
+                # ticks are sorted, so those in the last published millisecond come first
+                repeated = int(np.count_nonzero(new_ticks['time_msc'] == last_tick_time[symbol]))
+                new_ticks = new_ticks[min(repeated, last_tick_count[symbol]):]
+                if len(new_ticks) > 0:
+                    ticks[symbol].write(new_ticks)
+                    last_time = int(new_ticks['time_msc'][-1])
+                    if last_time != last_tick_time[symbol]:
+                        last_tick_count[symbol] = 0
+                    last_tick_count[symbol] += int(np.count_nonzero(new_ticks['time_msc'] == last_time))
+                    last_tick_time[symbol] = last_time
+
+            if risk_limits is not None:
+                risk_engine.sync(risk_manager)
+            while True:
+                try:
+                    intent = order_queue.get_nowait()
+                except queue.Empty:
+                    break
+                _execute_intent(intent, execution_handler)
+
+            if risk_limits is not None:
+                execution_handler.flush_pending()
+            time.sleep(poll_interval)
+    finally:
+        for ring in list(bars.values()) + list(ticks.values()):
+            ring.close()
+        data_provider.disconnect()
+
+
+def run_strategy_worker(strategy, bar_ring_name, order_queue, stop_event, poll_interval=0.05):
+    """
+    Runs a strategy on the bars of a shared ring and sends its signals to the publisher as order intents.
+
+    Meant to run in its own process, so CPU-heavy strategies do not compete with data polling and
+    order sending for the GIL. The strategy is evaluated on every new bar, in order, so bars published
+    together (e.g. after a late poll) each get their signal.
+
+    Args:
+        strategy: A strategy with `symbol`, `lookback_period`, `lot_size`, `position` and `generate_signal`.
+        bar_ring_name (str): The SharedRing name of the strategy symbol's bars.
+        order_queue (multiprocessing.Queue): Where order intents are sent.
+        stop_event (multiprocessing.Event): Set to stop the worker.
+        poll_interval (float): Seconds between checks for new bars.
+    """
+    bars = SharedRing(bar_ring_name, BAR_DTYPE)
+    lookback = strategy.lookback_period
+    sequence = 0
+
+    try:
+        while not stop_event.is_set():
+            end = bars.count
+            if end == sequence or end < lookback:
+                time.sleep(poll_interval)
+                continue
+
+            first = max(sequence + 1, lookback)
+            # windows ending before `oldest` have been overwritten by the writer
+            oldest = end - bars.capacity + lookback
+            if first < oldest:
+                print(f"Aviso: estrategia de {strategy.symbol} atrasada, {oldest - first} barras nao avaliadas.")
+                first = oldest
+
+            for seq in range(first, end + 1):
+                # the view is read straight from shared memory; the DataFrame holds only the lookback window
+                window = bars.latest(lookback, seq)
+                data = pd.DataFrame(window)
+                data['time'] = pd.to_datetime(data['time'], unit='s')
+                data.set_index('time', inplace=True)
+
+                position = strategy.position
+                signal = strategy.generate_signal(data)
+                if signal is not None:
+                    order_queue.put({'symbol': strategy.symbol, 'signal': signal, 'lot_size': strategy.lot_size,
+                                     'closing': position})
+            sequence = end
+    finally:
+        bars.close()
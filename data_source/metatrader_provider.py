@@ -0,0 +1,238 @@
+import pandas as pd
+import MetaTrader5 as mt5
+
+from datetime import datetime, timedelta, timezone
+
+from data_source.data_providers import DataProviderBase
+
+
+class MetaTraderDataProvider(DataProviderBase):
+    def __init__(self, api_key=None, tick_store=None):
+        # the terminal handles authentication; api_key is accepted for data_provider_factory compatibility
+        self.api_key = api_key
+        self.connected = False
+        self.tick_store = tick_store
+
+    def connect(self):
+        """
+        Connects to the MetaTrader 5 terminal.
+
+        Returns:
+            bool: True if the connection was successful, False otherwise.
+        """
+        if not self.connected:
+            self.connected = mt5.initialize()
+            return self.connected
+        return True
+
+    def disconnect(self):
+        """
+        Disconnects from the MetaTrader 5 terminal.
+        """
+        if self.connected:
+            mt5.shutdown()
+            self.connected = False
+
+    def get_ticks_from_start(self, symbol: str, start_date: str, end_date: str, flags=mt5.COPY_TICKS_ALL):
+        """
+        Retrieves ticks for a given symbol and date range. When the provider was created with a
+        tick_store, the raw ticks are also appended to it so later backtests can read them from disk.
+
+        Args:
+            symbol (str): The ticker symbol of the instrument.
+            start_date (str): The start date of the data (YYYY-MM-DD).
+            end_date (str): The end date of the data (YYYY-MM-DD).
+            flags (int): Type of requested data (mt5.COPY_TICKS_ALL, mt5.COPY_TICKS_INFO).
+
+        Returns:
+            Array of CopyTicks* structures or None in case of failure.
+        """
+        if not mt5.terminal_info():
+            print("Terminal is not connected, trying to connect...")
+            try:
+                self.connect()
+            except Exception as e:
+                print("Error: Not connected")
+                return None
+
+        ticks = mt5.copy_ticks_range(symbol, start_date, end_date, flags)
+
+        if ticks is None:
+            print('No ticks obtained')
+            return ticks
+        else:
+            print('Ticks obtained', len(ticks))
+
+        if self.tick_store is not None:
+            self.tick_store.append(symbol, ticks)
+
+        # create DataFrame out of the obtained data
+        ticks_frame = pd.DataFrame(ticks)
+        # convert time in seconds into the datetime format
+        ticks_frame['time'] = pd.to_datetime(ticks_frame['time'], unit='s')
+
+        # display data
+        print("\nDisplay dataframe with ticks")
+        print(ticks_frame.head(10))
+        return ticks_frame
+
+    def get_historical_data(self, symbol, start_date, end_date, interval=mt5.TIMEFRAME_M1):
+        """
+        Retrieves historical price data for a given symbol and date range.
+
+        Args:
+            symbol (str): The ticker symbol of the instrument.
+            start_date (str): The start date of the historical data (YYYY-MM-DD).
+            end_date (str): The end date of the historical data (YYYY-MM-DD).
+            interval (int): The timeframe of the historical data (e.g., mt5.TIMEFRAME_M1, mt5.TIMEFRAME_H1).
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the historical price data.
+        """
+        pd.set_option('display.max_columns', None)
+        pd.set_option('display.width', None)
+
+        if not self.connected:
+            try:
+                self.connect()
+            except Exception as e:
+                print("Error: Not connected to MetaTrader 5 terminal.")
+                return None
+
+        # create 'datetime' objects in UTC time zone to avoid the implementation of a local time zone offset
+        try:
+            data = mt5.copy_rates_range(symbol, interval, datetime.strptime(start_date, "%Y-%m-%d"),
+                                        datetime.strptime(end_date, "%Y-%m-%d"))
+            df = pd.DataFrame(data)
+            df['time'] = pd.to_datetime(df['time'], unit='s')
+            df.set_index('time', inplace=True)
+            return df
+        except Exception as e:
+            print(f"Error retrieving historical data for {symbol}: {str(e)}")
+            return None
+
+    def get_previous_rates(self, symbol, timeframe, count=5):
+        """
+        Fetches the previous N last candles as returned by the terminal, without building a DataFrame.
+
+        Args:
+            symbol (str): The ticker symbol of the instrument.
+            timeframe (int): The timeframe to retrieve data for (e.g., mt5.TIMEFRAME_M15 for 15-minute bars).
+            count (int) : The number of candles to retrieve.
+
+        Returns
+            np.ndarray: Structured array of MqlRates records, or None in case of failure.
+        """
+        if not self.connected:
+            try:
+                self.connect()
+            except Exception as e:
+                print("Erro: Falha ao conectar ao terminal MetaTrader 5.")
+                return None
+
+        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, count)
+        if rates is None:
+            print("Erro: Não foi possível obter dados OHLC.")
+        return rates
+
+    def get_rates_since(self, symbol, timeframe, start_time):
+        """
+        Fetches every candle opened at or after a given time, without building a DataFrame.
+
+        Args:
+            symbol (str): The ticker symbol of the instrument.
+            timeframe (int): The timeframe to retrieve data for (e.g., mt5.TIMEFRAME_M15 for 15-minute bars).
+            start_time (int): Open time of the first candle, in seconds (same scale as the rates 'time' field).
+
+        Returns
+            np.ndarray: Structured array of MqlRates records, or None in case of failure.
+        """
+        if not self.connected:
+            try:
+                self.connect()
+            except Exception as e:
+                print("Erro: Falha ao conectar ao terminal MetaTrader 5.")
+                return None
+
+        # the end is pushed forward because candle times are in the server's time zone
+        rates = mt5.copy_rates_range(symbol, timeframe, datetime.fromtimestamp(start_time, tz=timezone.utc),
+                                     datetime.now(timezone.utc) + timedelta(days=1))
+        if rates is None:
+            print("Erro: Não foi possível obter dados OHLC.")
+        return rates
+
+    def get_ticks_since(self, symbol, time_msc, count=100000):
+        """
+        Fetches up to `count` ticks from a given time onwards, without building a DataFrame.
+
+        copy_ticks_from starts at the whole second, so the result may include ticks before `time_msc`;
+        callers filter on the 'time_msc' field.
+
+        Args:
+            symbol (str): The ticker symbol of the instrument.
+            time_msc (int): Time of the first tick, in milliseconds (same scale as the ticks 'time_msc' field).
+            count (int): The maximum number of ticks returned.
+
+        Returns
+            np.ndarray: Structured array of tick records in time order, or None in case of failure.
+        """
+        if not self.connected:
+            try:
+                self.connect()
+            except Exception as e:
+                print("Erro: Falha ao conectar ao terminal MetaTrader 5.")
+                return None
+
+        ticks = mt5.copy_ticks_from(symbol, datetime.fromtimestamp(time_msc // 1000, tz=timezone.utc), count,
+                                    mt5.COPY_TICKS_ALL)
+        if ticks is None:
+            print("Erro: Não foi possível obter os ticks, codigo do erro =", mt5.last_error())
+        return ticks
+
+    def get_previous_candles(self, symbol, timeframe, count=5):
+        """
+                Fetches OHLC data for the previous N last candles.
+
+                Args:
+                    symbol (str): The ticker symbol of the instrument.
+                    timeframe (int): The timeframe to retrieve data for (e.g., mt5.TIMEFRAME_M15 for 15-minute bars).
+                    count (int) : The number of candles to retrieve.
+
+                Returns
+                    pandas.DataFrame: A DataFrame containing the OHLC data.
+                """
+
+        pd.set_option('display.max_columns', None)
+        pd.set_option('display.width', 2500)
+
+        rates = self.get_previous_rates(symbol, timeframe, count)
+        if rates is None:
+            return None
+        else:
+            df = pd.DataFrame(rates)
+            df['time'] = pd.to_datetime(df['time'], unit='s')
+            df.set_index('time', inplace=True)
+
+        return df
+
+    def get_realtime_data(self, symbol):
+        """
+        Retrieves real-time price data for a given symbol.
+
+        Args:
+            symbol (str): The ticker symbol of the instrument.
+
+        Returns:
+            float: The current price of the instrument.
+        """
+        if not self.connected:
+            print("Error: Not connected to MetaTrader 5 terminal.")
+            return None
+
+        try:
+            rates = mt5.symbol_info_tick(symbol)
+            # print(f"{symbol} - last: {rates.last}, bid: {rates.bid}, ask: {rates.ask}")
+            return rates
+        except Exception as e:
+            print(f"Error retrieving real-time data for {symbol}: {str(e)}")
+            return None
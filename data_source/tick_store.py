@@ -0,0 +1,184 @@
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+
+
+# Same layout as the structured array returned by mt5.copy_ticks_range / mt5.copy_ticks_from
+TICK_DTYPE = np.dtype([
+    ('time', '<i8'),
+    ('bid', '<f8'),
+    ('ask', '<f8'),
+    ('last', '<f8'),
+    ('volume', '<u8'),
+    ('time_msc', '<i8'),
+    ('flags', '<u4'),
+    ('volume_real', '<f8'),
+])
+
+MSC_PER_DAY = 86_400_000
+
+
+class TickStore:
+    """
+    Persistent tick store with one append-only binary file per symbol and per day.
+
+    Files contain raw TICK_DTYPE records in time order, so readers can open them with
+    np.memmap and share the OS page cache with every other process reading the same day.
+    """
+
+    def __init__(self, root_dir, index_stride=4096):
+        self.root_dir = root_dir
+        self.index_stride = index_stride
+        self._indexes = {}
+
+    def _day_path(self, symbol, day):
+        return os.path.join(self.root_dir, symbol, f"{day}.ticks")
+
+    def days(self, symbol):
+        """
+        Lists the days stored for a symbol.
+
+        Args:
+            symbol (str): The ticker symbol of the instrument.
+
+        Returns:
+            list: Sorted day strings (YYYY-MM-DD).
+        """
+        symbol_dir = os.path.join(self.root_dir, symbol)
+        if not os.path.isdir(symbol_dir):
+            return []
+        return sorted(name[:-len('.ticks')] for name in os.listdir(symbol_dir) if name.endswith('.ticks'))
+
+    def append(self, symbol, ticks):
+        """
+        Appends ticks to the per-day files of a symbol.
+
+        Files are append-only, so the ticks of a day must start after the ticks already stored for it.
+        Only an exact overlap is dropped: when the first incoming ticks are identical to the stored tail
+        (e.g. copy_ticks_range including both ends, or a re-download of the same range), those records
+        are skipped and the rest is appended, including new ticks in the last stored millisecond.
+        Ticks that overlap the stored data without matching it, such as a backfill of an earlier range,
+        are rejected with a message and not written.
+
+        Args:
+            symbol (str): The ticker symbol of the instrument.
+            ticks (np.ndarray): Structured array with the copy_ticks_range layout, sorted by time_msc.
+
+        Returns:
+            int: The number of ticks written. Rejected days are not counted.
+        """
+        if ticks is None or len(ticks) == 0:
+            return 0
+
+        ticks = np.asarray(ticks).astype(TICK_DTYPE, copy=False)
+        day_numbers = ticks['time_msc'] // MSC_PER_DAY
+        # ticks are sorted, so each day is a contiguous run
+        boundaries = np.flatnonzero(np.diff(day_numbers)) + 1
+        written = 0
+
+        for day_ticks in np.split(ticks, boundaries):
+            day = (datetime(1970, 1, 1) + timedelta(days=int(day_ticks['time_msc'][0] // MSC_PER_DAY))).strftime('%Y-%m-%d')
+            path = self._day_path(symbol, day)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            stored_tail = self._stored_tail(path, int(day_ticks['time_msc'][0]))
+            if len(stored_tail) > 0:
+                overlap = np.ascontiguousarray(day_ticks[:len(stored_tail)])
+                if len(overlap) < len(stored_tail) or overlap.tobytes() != stored_tail.tobytes():
+                    print(f"Ticks de {symbol} em {day} rejeitados: nao continuam os ticks ja gravados "
+                          f"(arquivo somente de acrescimo).")
+                    continue
+                day_ticks = day_ticks[len(stored_tail):]
+            if len(day_ticks) == 0:
+                continue
+
+            with open(path, 'ab') as f:
+                f.write(np.ascontiguousarray(day_ticks).tobytes())
+            self._indexes.pop(path, None)
+            written += len(day_ticks)
+
+        return written
+
+    def _stored_tail(self, path, time_msc):
+        # copy of the stored ticks at or after `time_msc`, the part an incoming batch may overlap
+        count = os.path.getsize(path) // TICK_DTYPE.itemsize if os.path.exists(path) else 0
+        if count == 0:
+            return np.empty(0, dtype=TICK_DTYPE)
+        stored = np.memmap(path, dtype=TICK_DTYPE, mode='r', shape=(count,))
+        start = int(np.searchsorted(stored['time_msc'], time_msc, side='left'))
+        tail = np.array(stored[start:])
+        del stored
+        return tail
+
+    def open_day(self, symbol, day):
+        """
+        Memory-maps the ticks of a symbol for one day.
+
+        Args:
+            symbol (str): The ticker symbol of the instrument.
+            day (str): The day to open (YYYY-MM-DD).
+
+        Returns:
+            np.memmap: Read-only view of the stored ticks, or an empty array if the day is not stored.
+        """
+        path = self._day_path(symbol, day)
+        if not os.path.exists(path):
+            return np.empty(0, dtype=TICK_DTYPE)
+        # ignore a partially written trailing record from a concurrent writer
+        count = os.path.getsize(path) // TICK_DTYPE.itemsize
+        if count == 0:
+            return np.empty(0, dtype=TICK_DTYPE)
+        return np.memmap(path, dtype=TICK_DTYPE, mode='r', shape=(count,))
+
+    def _sparse_index(self, path, ticks):
+        index = self._indexes.get(path)
+        if index is None or index[1] != len(ticks):
+            # one time_msc every `index_stride` ticks; only touches one page per stride
+            index = (np.array(ticks['time_msc'][::self.index_stride]), len(ticks))
+            self._indexes[path] = index
+        return index[0]
+
+    def _search(self, path, ticks, time_msc, side):
+        index = self._sparse_index(path, ticks)
+        block = max(int(np.searchsorted(index, time_msc, side=side)) - 1, 0)
+        lo = block * self.index_stride
+        hi = min(lo + 2 * self.index_stride, len(ticks))
+        return lo + int(np.searchsorted(ticks['time_msc'][lo:hi], time_msc, side=side))
+
+    def read_range(self, symbol, start, end):
+        """
+        Retrieves the stored ticks of a symbol in the interval [start, end).
+
+        Each day is memory-mapped and sliced with a binary search over its sparse time index,
+        so only the pages inside the requested range are read.
+
+        Args:
+            symbol (str): The ticker symbol of the instrument.
+            start (datetime): Start of the interval (UTC).
+            end (datetime): End of the interval (UTC), exclusive.
+
+        Returns:
+            np.ndarray: The ticks in the interval. A zero-copy memmap slice when the range fits
+            in a single day, a concatenated copy otherwise.
+        """
+        start_msc = int((start - datetime(1970, 1, 1)).total_seconds() * 1000)
+        end_msc = int((end - datetime(1970, 1, 1)).total_seconds() * 1000)
+
+        parts = []
+        for day_number in range(start_msc // MSC_PER_DAY, (end_msc - 1) // MSC_PER_DAY + 1):
+            day = (datetime(1970, 1, 1) + timedelta(days=day_number)).strftime('%Y-%m-%d')
+            ticks = self.open_day(symbol, day)
+            if len(ticks) == 0:
+                continue
+            path = self._day_path(symbol, day)
+            lo = self._search(path, ticks, start_msc, 'left')
+            hi = self._search(path, ticks, end_msc, 'left')
+            if hi > lo:
+                parts.append(ticks[lo:hi])
+
+        if not parts:
+            return np.empty(0, dtype=TICK_DTYPE)
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts)
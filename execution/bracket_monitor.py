@@ -0,0 +1,133 @@
+import numpy as np
+
+
+class _SymbolBrackets:
+    def __init__(self, capacity=16):
+        self.size = 0
+        self.tickets = np.zeros(capacity, dtype=np.int64)
+        self.volumes = np.zeros(capacity)
+        self.take_profits = np.full(capacity, np.nan)
+        self.stop_losses = np.full(capacity, np.nan)
+
+    def _grow(self):
+        capacity = 2 * len(self.tickets)
+        self.tickets = np.resize(self.tickets, capacity)
+        self.volumes = np.resize(self.volumes, capacity)
+        self.take_profits = np.resize(self.take_profits, capacity)
+        self.stop_losses = np.resize(self.stop_losses, capacity)
+
+    def add(self, ticket, volume, take_profit, stop_loss):
+        if self.size == len(self.tickets):
+            self._grow()
+        i = self.size
+        self.tickets[i] = ticket
+        self.volumes[i] = volume
+        self.take_profits[i] = take_profit
+        self.stop_losses[i] = stop_loss
+        self.size += 1
+
+    def keep(self, mask):
+        kept = int(mask.sum())
+        for column in (self.tickets, self.volumes, self.take_profits, self.stop_losses):
+            column[:kept] = column[:self.size][mask]
+        self.size = kept
+
+    def triggered(self, price):
+        n = self.size
+        long = self.volumes[:n] > 0
+        take_profits = self.take_profits[:n]
+        stop_losses = self.stop_losses[:n]
+        # comparisons with NaN (level not set) are always False
+        with np.errstate(invalid='ignore'):
+            return np.where(long,
+                            (price >= take_profits) | (price <= stop_losses),
+                            (price <= take_profits) | (price >= stop_losses))
+
+
+class BracketMonitor:
+    """
+    Keeps client-side take profit and stop loss levels of open positions in arrays, per symbol.
+
+    Each price update is compared with all the brackets of its symbol at once, and close orders are
+    sent only for the positions that triggered. Only monitor levels that are not also set on the
+    server as the order's sl/tp, otherwise the terminal closes the position and the monitor would send
+    an opposite order. Volumes are signed: positive for long positions, negative for short ones, as
+    in MetaTraderExecutionHandler.close_position.
+    """
+
+    def __init__(self, execution_handler):
+        self.execution_handler = execution_handler
+        self.brackets = {}
+
+    def symbols(self):
+        return [symbol for symbol, brackets in self.brackets.items() if brackets.size > 0]
+
+    def add(self, ticket, symbol, volume, take_profit=None, stop_loss=None):
+        """
+        Starts monitoring a position.
+
+        Args:
+            ticket (int): The position ticket number.
+            symbol (str): The ticker symbol of the instrument.
+            volume (float): Signed position volume (positive for long, negative for short).
+            take_profit (float): The take profit price, or None.
+            stop_loss (float): The stop loss price, or None.
+        """
+        if symbol not in self.brackets:
+            self.brackets[symbol] = _SymbolBrackets()
+        self.brackets[symbol].add(ticket, volume,
+                                  np.nan if not take_profit else take_profit,
+                                  np.nan if not stop_loss else stop_loss)
+
+    def remove(self, ticket, symbol):
+        brackets = self.brackets.get(symbol)
+        if brackets is not None:
+            brackets.keep(brackets.tickets[:brackets.size] != ticket)
+
+    def sync_open_tickets(self, tickets):
+        """
+        Drops the brackets of positions that are no longer open, e.g. closed by the server or by hand.
+
+        Args:
+            tickets (iterable): The tickets of the positions currently open in the terminal.
+        """
+        open_tickets = np.fromiter(tickets, dtype=np.int64)
+        for brackets in self.brackets.values():
+            brackets.keep(np.isin(brackets.tickets[:brackets.size], open_tickets))
+
+    def on_tick(self, symbol, price):
+        """
+        Checks every bracket of a symbol against a new price and closes the positions that triggered.
+
+        Triggered brackets are removed whether the close order succeeds or not, so a failed close is
+        never resent blindly on the next tick.
+
+        Args:
+            symbol (str): The ticker symbol of the instrument.
+            price (float): The latest price.
+
+        Returns:
+            list: The tickets of the positions closed.
+        """
+        brackets = self.brackets.get(symbol)
+        if brackets is None or brackets.size == 0:
+            return []
+
+        triggered = np.flatnonzero(brackets.triggered(price))
+        if len(triggered) == 0:
+            return []
+
+        tickets = brackets.tickets[triggered].copy()
+        volumes = brackets.volumes[triggered].copy()
+        keep = np.ones(brackets.size, dtype=bool)
+        keep[triggered] = False
+        brackets.keep(keep)
+
+        closed = []
+        for ticket, volume in zip(tickets, volumes):
+            print(f"Take profit/stop loss alcançado para a posicao #{ticket} de {symbol}.")
+            if self.execution_handler.close_position(int(ticket), symbol, float(volume)):
+                closed.append(int(ticket))
+            else:
+                print(f"Posicao #{ticket} nao foi fechada e deixou de ser monitorada.")
+        return closed
@@ -6,8 +6,16 @@ import time
 
 
 class MetaTraderExecutionHandler:
-    def __init__(self):
+    def __init__(self, bracket_monitor=None, bracket_points=100):
+        """
+        Args:
+            bracket_monitor (BracketMonitor): If set, the take profit and stop loss of new orders are
+                monitored client-side instead of being sent as the order's sl/tp.
+            bracket_points (int): Distance in points from the entry price to the take profit and stop loss.
+        """
         self.connected = False
+        self.bracket_monitor = bracket_monitor
+        self.bracket_points = bracket_points
 
     def connect(self):
         """
@@ -57,7 +65,44 @@ class MetaTraderExecutionHandler:
 
         return False
 
-    def market_buy_order(self, symbol, volume, deviation=20):
+    def check_brackets(self, bracket_monitor):
+        """
+        Fetches one tick per monitored symbol and checks all take profit/stop loss levels at once.
+
+        The open positions are fetched first (one call for all symbols), so brackets of positions the
+        server already closed are dropped instead of triggering an opposite order.
+
+        Args:
+            bracket_monitor (BracketMonitor): The monitor holding the open positions' brackets.
+
+        Returns:
+            list: The tickets of the positions closed.
+        """
+        if not self.connected:
+            try:
+                self.connect()
+            except Exception as e:
+                print("Erro: Falha ao conectar ao terminal MetaTrader 5.")
+                return []
+
+        positions = mt5.positions_get()
+        if positions is None:
+            print("Erro ao obter as posicoes, codigo do erro =", mt5.last_error())
+            return []
+        bracket_monitor.sync_open_tickets(position.ticket for position in positions)
+
+        closed = []
+        for symbol in bracket_monitor.symbols():
+            tick = mt5.symbol_info_tick(symbol)
+            if tick is not None:
+                closed.extend(bracket_monitor.on_tick(symbol, tick.last))
+        return closed
+
+    def _register_bracket(self, ticket, symbol, volume, take_profit, stop_loss):
+        # MetaTrader numbers a position with the ticket of the order that opened it
+        self.bracket_monitor.add(ticket, symbol, volume, take_profit=take_profit, stop_loss=stop_loss)
+
+    def market_buy_order(self, symbol, volume, deviation=20, register_bracket=True):
         """
         Places an order in the MetaTrader 5 terminal.
 
@@ -67,6 +112,7 @@ class MetaTraderExecutionHandler:
             volume (float): The volume of the order (e.g., 1 lot of a future mini-contract)
             order_type (int): The type of the order (e.g., mt5.ORDER_TYPE_BUY, mt5.ORDER_TYPE_SELL).
             deviation (int): The deviation in points from the current price.
+            register_bracket (bool): If False, no take profit or stop loss is set (e.g., closing orders).
 
         Returns:
             int: The order ticket number.
@@ -80,6 +126,8 @@ class MetaTraderExecutionHandler:
         
         point = mt5.symbol_info(symbol).point
         price = mt5.symbol_info_tick(symbol).ask #if order_type == mt5.ORDER_TYPE_BUY else mt5.symbol_info_tick(symbol).bid
+        stop_loss = price - self.bracket_points * point
+        take_profit = price + self.bracket_points * point
 
         request = {
             "action": mt5.TRADE_ACTION_DEAL,
@@ -87,14 +135,14 @@ class MetaTraderExecutionHandler:
             "volume": volume,
             "type": mt5.ORDER_TYPE_BUY,
             "price": price,
-            "sl": price - 100 * point,
-            "tp": price + 100 * point,
             "deviation": deviation,
             "magic": 234000,
             "comment": "Python script open trade",
             "type_time": mt5.ORDER_TIME_GTC,
             "type_filling": mt5.ORDER_FILLING_RETURN
         }
+        if register_bracket and self.bracket_monitor is None:
+            request.update({"sl": stop_loss, "tp": take_profit})
 
         result = mt5.order_send(request)
         print(f"Ordem enviada: {volume} lote de {symbol} ao preco de {price} com desvio de {deviation} pontos")
@@ -110,9 +158,11 @@ class MetaTraderExecutionHandler:
                         print("       traderequest: {}={}".format(tradereq_filed, traderequest_dict[tradereq_filed]))
             return None
 
+        if register_bracket and self.bracket_monitor is not None:
+            self._register_bracket(result.order, symbol, volume, take_profit, stop_loss)
         return result.order
     
-    def market_sell_order(self, symbol, volume, deviation=20):
+    def market_sell_order(self, symbol, volume, deviation=20, register_bracket=True):
         """
         Places an order in the MetaTrader 5 terminal.
 
@@ -122,6 +172,7 @@ class MetaTraderExecutionHandler:
             volume (float): The volume of the order (e.g., 1 lot of a future mini-contract)
             order_type (int): The type of the order (e.g., mt5.ORDER_TYPE_BUY, mt5.ORDER_TYPE_SELL).
             deviation (int): The deviation in points from the current price.
+            register_bracket (bool): If False, no take profit or stop loss is set (e.g., closing orders).
 
         Returns:
             int: The order ticket number.
@@ -135,6 +186,8 @@ class MetaTraderExecutionHandler:
         
         point = mt5.symbol_info(symbol).point
         price = mt5.symbol_info_tick(symbol).bid
+        stop_loss = price + self.bracket_points * point
+        take_profit = price - self.bracket_points * point
 
         request = {
             "action": mt5.TRADE_ACTION_DEAL,
@@ -142,14 +195,14 @@ class MetaTraderExecutionHandler:
             "volume": volume,
             "type": mt5.ORDER_TYPE_SELL,
             "price": price,
-            "sl": price + 100 * point,
-            "tp": price - 100 * point,
             "deviation": deviation,
             "magic": 234000,
             "comment": "Python script open trade",
             "type_time": mt5.ORDER_TIME_GTC,
             "type_filling": mt5.ORDER_FILLING_RETURN
         }
+        if register_bracket and self.bracket_monitor is None:
+            request.update({"sl": stop_loss, "tp": take_profit})
 
         result = mt5.order_send(request)
 
@@ -164,8 +217,10 @@ class MetaTraderExecutionHandler:
                     for tradereq_filed in traderequest_dict:
                         print("       traderequest: {}={}".format(tradereq_filed, traderequest_dict[tradereq_filed]))
             return None
-        
-        return True
+
+        if register_bracket and self.bracket_monitor is not None:
+            self._register_bracket(result.order, symbol, -volume, take_profit, stop_loss)
+        return result.order
     
     def close_position(self, position_id, symbol, volume: float):
         """
@@ -174,7 +229,8 @@ class MetaTraderExecutionHandler:
         Args:
             position_id (int): The position ticket number.
             symbol (str): The ticker symbol of the instrument.
-            volume (float): The volume of the order (e.g., 1 lot of a future mini-contract)
+            volume (float): Signed volume of the position: positive closes a long with a sell,
+                negative closes a short with a buy.
 
         Returns:
             bool: True if the position was closed successfully, False otherwise.
@@ -193,17 +249,16 @@ class MetaTraderExecutionHandler:
         if volume > 0.0:
             print("Fechando posicao #{}: venda de {} lotes de {} no preco {}".format(
                 position_id, volume, symbol, price, deviation))
-            position_closed = self.market_sell_order(symbol, volume)
+            position_closed = self.market_sell_order(symbol, volume, register_bracket=False) is not None
 
         elif volume < 0.0:
             print("Fechando posicao #{}: compra de {} lotes de {} no preco {}".format(
                 position_id, volume, symbol, price, deviation))
-            position_closed = self.market_buy_order(symbol, volume)
+            position_closed = self.market_buy_order(symbol, abs(volume), register_bracket=False) is not None
 
-        if position_closed is False:
+        if not position_closed:
             print("Erro ao fechar posicao #{}".format(position_id))
             return False
-        
-        elif position_closed is True:
-            print("Posicao #{} fechada com sucesso.".format(position_id))
-            return True
+
+        print("Posicao #{} fechada com sucesso.".format(position_id))
+        return True
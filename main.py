@@ -1,14 +1,10 @@
-from datetime import datetime
-import MetaTrader5 as mt5
 import time
+startup_start = time.perf_counter()
+
+from datetime import datetime
 import pytz
-from pytz import timezone
 
-from data_source.data_providers import data_provider_factory
-from execution.execution_handler import ExecutionHandler
-from execution.meta_trader_handler import MetaTraderExecutionHandler
-from risk_management.risk_manager import RiskManagement
-from strategies.mean_reversion import MeanReversionStrategy
+from data_source.data_providers import data_provider_factory, provider_load_times
 
 
 def main():
@@ -18,7 +14,20 @@ def main():
         'data_provider': 'metatrader',
         'api_key': None
     }
+    # MetaTrader5 and pandas are first imported here, by the provider, so the timing below is real
     data_provider = data_provider_factory(config['data_provider'])
+    load_time = provider_load_times.get(config['data_provider'])
+    if load_time is not None:
+        print(f"Provedor '{config['data_provider']}' importado em {load_time * 1000:.1f} ms")
+    print(f"Inicializacao em {(time.perf_counter() - startup_start) * 1000:.1f} ms")
+
+    import MetaTrader5 as mt5
+    from execution.bracket_monitor import BracketMonitor
+    from execution.meta_trader_handler import MetaTraderExecutionHandler
+    from risk_management.pre_trade import PreTradeRiskEngine, RiskCheckedExecutionHandler
+    from risk_management.risk_manager import RiskManagement
+    from strategies.mean_reversion import MeanReversionStrategy
+
     symbol = 'WINM24'  # Bovespa Mini Index Futures symbol - '^BVSP' from Yahoo or 'WINM24' from metatrader
     interval = mt5.TIMEFRAME_M1  # interval, mt5.TIMEFRAME_M1 for 1 minute time frame
 
@@ -27,8 +36,15 @@ def main():
     end_date = '2024-05-04'
     all_candles = data_provider.get_historical_data(symbol, start_date, end_date, interval)
 
-    metatrader = MetaTraderExecutionHandler()
     risk_manager = RiskManagement()
+    # Pre-trade limits are checked in memory; the terminal state is refreshed once per loop, not per order
+    risk_engine = PreTradeRiskEngine(max_position=5.0, daily_loss_limit=500.0, max_open_orders=1,
+                                     max_orders_per_second=2)
+    execution_handler = MetaTraderExecutionHandler()
+    # take profit/stop loss are checked client-side; bracket closes skip the throttle queue
+    bracket_monitor = BracketMonitor(execution_handler)
+    execution_handler.bracket_monitor = bracket_monitor
+    metatrader = RiskCheckedExecutionHandler(execution_handler, risk_engine)
 
     # previous_n_candles = data_provider.get_previous_candles(symbol, mt5.TIMEFRAME_M1, count=20)
     # print('previous_n_candles', previous_n_candles)
@@ -54,7 +70,10 @@ def main():
 
         signal = strategy.generate_signal(data)
 
+        risk_engine.sync(risk_manager)
         strategy.execute_signal(signal, metatrader)
+        metatrader.flush_pending()
+        execution_handler.check_brackets(bracket_monitor)
         time.sleep(poll_interval)
 
     # position = risk_manager.get_positions()
@@ -0,0 +1,65 @@
+# Entry point of the multi-process mode: python main_multiprocess.py
+# Strategy workers are started with 'spawn', which re-imports this module in every child, so only what
+# the workers need is imported at module level; MetaTrader5 and the strategies are imported lazily.
+from datetime import datetime
+import multiprocessing
+import time
+
+import pytz
+
+from data_source.market_data_bus import BAR_DTYPE, SharedRing, run_market_data_publisher, run_strategy_worker
+from data_source.tick_store import TICK_DTYPE
+
+
+def main_multiprocess():
+    # One publisher process owns the terminal connection; each strategy runs in its own process and
+    # reads bars from shared memory, sending order intents back through a queue.
+    import MetaTrader5 as mt5
+    from strategies.mean_reversion import MeanReversionStrategy
+
+    symbols = ['WINM24']
+    risk_limits = {'max_position': 5.0, 'daily_loss_limit': 500.0, 'max_open_orders': 1, 'max_orders_per_second': 2}
+
+    bar_rings = {symbol: SharedRing(f"bars_{symbol}", BAR_DTYPE, capacity=4096) for symbol in symbols}
+    tick_rings = {symbol: SharedRing(f"ticks_{symbol}", TICK_DTYPE, capacity=65536) for symbol in symbols}
+
+    context = multiprocessing.get_context('spawn')
+    order_queue = context.Queue()
+    stop_event = context.Event()
+
+    publisher = context.Process(target=run_market_data_publisher,
+                                args=(symbols, {s: r.name for s, r in bar_rings.items()},
+                                      {s: r.name for s, r in tick_rings.items()}, order_queue, stop_event,
+                                      mt5.TIMEFRAME_M1),
+                                kwargs={'risk_limits': risk_limits})
+    workers = [
+        context.Process(target=run_strategy_worker,
+                        args=(MeanReversionStrategy(symbol, lookback_period=20, entry_threshold=2, exit_threshold=1,
+                                                    lot_size=1.0),
+                              bar_rings[symbol].name, order_queue, stop_event))
+        for symbol in symbols
+    ]
+
+    publisher.start()
+    for worker in workers:
+        worker.start()
+
+    try:
+        while True:
+            now = datetime.now(pytz.timezone('America/Sao_Paulo'))
+            # If time is 6:25PM or later, stop the processes
+            if (now.hour, now.minute) >= (18, 25):
+                print("Operacoes finalizadas para o dia.")
+                break
+            time.sleep(1)
+    finally:
+        stop_event.set()
+        for process in workers + [publisher]:
+            process.join()
+        for ring in list(bar_rings.values()) + list(tick_rings.values()):
+            ring.close()
+            ring.unlink()
+
+
+if __name__ == '__main__':
+    main_multiprocess()
@@ -0,0 +1,227 @@
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+
+# Rejection reasons returned by PreTradeRiskEngine.check
+THROTTLED = 'THROTTLED'
+MAX_POSITION = 'MAX_POSITION'
+DAILY_LOSS_LIMIT = 'DAILY_LOSS_LIMIT'
+MAX_OPEN_ORDERS = 'MAX_OPEN_ORDERS'
+
+
+class PreTradeRiskEngine:
+    """
+    Pre-trade limits evaluated against in-memory state only, so a check never calls the terminal.
+
+    The state is refreshed from the terminal with `sync` once per poll loop, not per order, since the
+    server closes positions on their SL/TP without the engine seeing it. Volumes are signed: positive
+    for buys, negative for sells. A limit set to None is disabled.
+    """
+
+    def __init__(self, max_position=None, daily_loss_limit=None, max_open_orders=None, max_orders_per_second=None,
+                 clock=time.monotonic):
+        self.max_position = max_position
+        self.daily_loss_limit = daily_loss_limit
+        self.max_open_orders = max_open_orders
+        self.max_orders_per_second = max_orders_per_second
+        self.clock = clock
+
+        self.positions = {}
+        self.open_orders = 0
+        self.realized_pnl = 0.0
+        self._order_times = deque()
+        self._day_end = self._next_day_end()
+
+    @staticmethod
+    def _next_day_end():
+        tomorrow = datetime.now().date() + timedelta(days=1)
+        return datetime(tomorrow.year, tomorrow.month, tomorrow.day).timestamp()
+
+    def _roll_day(self):
+        if time.time() >= self._day_end:
+            self.realized_pnl = 0.0
+            self._day_end = self._next_day_end()
+
+    def check(self, symbol, volume):
+        """
+        Evaluates an order against every limit.
+
+        Orders that reduce the current position are not blocked by the position and daily loss limits,
+        so positions can always be closed.
+
+        Args:
+            symbol (str): The ticker symbol of the instrument.
+            volume (float): Signed order volume (positive to buy, negative to sell).
+
+        Returns:
+            str: The rejection reason, or None if the order is allowed.
+        """
+        if self.max_orders_per_second is not None:
+            now = self.clock()
+            while self._order_times and now - self._order_times[0] >= 1.0:
+                self._order_times.popleft()
+            if len(self._order_times) >= self.max_orders_per_second:
+                return THROTTLED
+
+        if self.max_open_orders is not None and self.open_orders >= self.max_open_orders:
+            return MAX_OPEN_ORDERS
+
+        current = self.positions.get(symbol, 0.0)
+        new_position = current + volume
+        if abs(new_position) < abs(current) and current * new_position >= 0:
+            return None
+
+        if self.daily_loss_limit is not None:
+            self._roll_day()
+            if -self.realized_pnl >= self.daily_loss_limit:
+                return DAILY_LOSS_LIMIT
+
+        if self.max_position is not None and abs(new_position) > self.max_position:
+            return MAX_POSITION
+
+        return None
+
+    def on_order_sent(self, symbol, volume):
+        self._order_times.append(self.clock())
+
+    def on_order_done(self, symbol, volume, filled):
+        if filled:
+            self.positions[symbol] = self.positions.get(symbol, 0.0) + volume
+
+    def sync(self, risk_manager):
+        """
+        Refreshes positions, working orders and the day's realized PnL from the terminal.
+
+        Args:
+            risk_manager (RiskManagement): Used to query the terminal.
+        """
+        self.sync_positions(risk_manager.get_open_positions())
+        self.sync_open_orders(risk_manager.get_orders_total())
+        self.sync_realized_pnl(risk_manager.get_daily_realized_pnl())
+
+    def sync_open_orders(self, orders_total):
+        """
+        Sets the number of orders still working in the terminal (pending or partially filled).
+
+        Market orders are filled or rejected inside order_send, so only terminal orders count here.
+        """
+        if orders_total is not None:
+            self.open_orders = orders_total
+
+    def sync_realized_pnl(self, realized_pnl):
+        """
+        Sets the realized PnL of the day, e.g. from RiskManagement.get_daily_realized_pnl.
+        """
+        if realized_pnl is not None:
+            self._roll_day()
+            self.realized_pnl = realized_pnl
+
+    def sync_positions(self, positions):
+        """
+        Replaces the in-memory positions with the terminal positions (called by `sync`).
+
+        Args:
+            positions (iterable): The output of RiskManagement.get_open_positions: position objects with
+                `symbol`, `volume` and `type`, empty when flat. None (query failed) keeps the previous
+                positions, so a failed query never looks like a flat book.
+        """
+        if positions is None:
+            return
+        synced = {}
+        for position in positions:
+            # type 0 is POSITION_TYPE_BUY, 1 is POSITION_TYPE_SELL
+            signed_volume = float(position.volume) if position.type == 0 else -float(position.volume)
+            synced[position.symbol] = synced.get(position.symbol, 0.0) + signed_volume
+        self.positions = synced
+
+
+class RiskCheckedExecutionHandler:
+    """
+    Wraps an execution handler so every order passes PreTradeRiskEngine.check before reaching the terminal.
+
+    Throttled orders are queued and sent by `flush_pending` once the rate allows; orders breaking any
+    other limit are rejected. While a symbol has queued orders, new orders for it are queued behind
+    them, so orders of a symbol always reach the terminal in the order they were placed. Queued orders
+    older than `max_pending_age` seconds are dropped instead of being sent on stale signals.
+    """
+
+    def __init__(self, execution_handler, risk_engine, queue_throttled=True, max_pending_age=5.0):
+        self.execution_handler = execution_handler
+        self.risk_engine = risk_engine
+        self.queue_throttled = queue_throttled
+        self.max_pending_age = max_pending_age
+        self.pending = deque()
+        self._pending_per_symbol = {}
+
+    def market_buy_order(self, symbol, volume, deviation=20):
+        return self._submit(symbol, volume, self.execution_handler.market_buy_order, (symbol, volume, deviation))
+
+    def market_sell_order(self, symbol, volume, deviation=20):
+        return self._submit(symbol, -volume, self.execution_handler.market_sell_order, (symbol, volume, deviation))
+
+    def close_position(self, position_id, symbol, volume):
+        # a positive volume closes a long position with a sell, a negative one closes a short with a buy
+        return self._submit(symbol, -volume, self.execution_handler.close_position, (position_id, symbol, volume))
+
+    def _submit(self, symbol, signed_volume, send, args):
+        if self._pending_per_symbol.get(symbol):
+            print(f"Ordem de {signed_volume} lotes de {symbol} na fila: ha ordens anteriores do ativo na fila.")
+            self._enqueue(symbol, signed_volume, send, args)
+            return None
+
+        reason = self.risk_engine.check(symbol, signed_volume)
+
+        if reason == THROTTLED and self.queue_throttled:
+            print(f"Ordem de {signed_volume} lotes de {symbol} na fila: limite de ordens por segundo.")
+            self._enqueue(symbol, signed_volume, send, args)
+            return None
+        elif reason is not None:
+            print(f"Ordem de {signed_volume} lotes de {symbol} rejeitada pelo risco: {reason}")
+            return None
+
+        return self._send(symbol, signed_volume, send, args)
+
+    def _enqueue(self, symbol, signed_volume, send, args):
+        self.pending.append((symbol, signed_volume, send, args, self.risk_engine.clock()))
+        self._pending_per_symbol[symbol] = self._pending_per_symbol.get(symbol, 0) + 1
+
+    def _dequeue(self):
+        entry = self.pending.popleft()
+        self._pending_per_symbol[entry[0]] -= 1
+        return entry
+
+    def _send(self, symbol, signed_volume, send, args):
+        self.risk_engine.on_order_sent(symbol, signed_volume)
+        result = None
+        try:
+            result = send(*args)
+        finally:
+            self.risk_engine.on_order_done(symbol, signed_volume, filled=result is not None and result is not False)
+        return result
+
+    def flush_pending(self):
+        """
+        Sends queued orders while the limits allow, in arrival order. Orders queued for longer than
+        `max_pending_age` seconds are dropped.
+
+        Returns:
+            int: The number of orders sent.
+        """
+        sent = 0
+        while self.pending:
+            symbol, signed_volume, send, args, queued_at = self.pending[0]
+            if self.max_pending_age is not None and self.risk_engine.clock() - queued_at > self.max_pending_age:
+                self._dequeue()
+                print(f"Ordem na fila de {signed_volume} lotes de {symbol} descartada: expirou na fila.")
+                continue
+            reason = self.risk_engine.check(symbol, signed_volume)
+            if reason == THROTTLED:
+                break
+            self._dequeue()
+            if reason is not None:
+                print(f"Ordem na fila de {signed_volume} lotes de {symbol} rejeitada pelo risco: {reason}")
+                continue
+            self._send(symbol, signed_volume, send, args)
+            sent += 1
+        return sent
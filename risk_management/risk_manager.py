@@ -1,6 +1,8 @@
 import MetaTrader5 as mt5
 import pandas as pd
 
+from datetime import datetime, timedelta
+
 
 class RiskManagement():
     def __init__(self):
@@ -34,3 +36,59 @@ class RiskManagement():
         except Exception as e:
             print(f"Erro ao obter as posicoes: {str(e)}")
             return None
+
+    def get_open_positions(self):
+        """
+        Retrieves the open positions for the pre-trade risk sync, without reconnecting or printing.
+
+        Unlike `get_positions`, being flat and failing are told apart.
+
+        Returns:
+            tuple: The TradePosition objects, empty if there are no open positions, or None in case of failure.
+        """
+        try:
+            positions = mt5.positions_get()
+        except Exception as e:
+            print(f"Erro ao obter as posicoes: {str(e)}")
+            return None
+        if positions is None:
+            print("Erro ao obter as posicoes, codigo do erro =", mt5.last_error())
+        return positions
+
+    def get_orders_total(self):
+        """
+        Retrieves the number of orders still working in the MetaTrader 5 terminal.
+
+        Returns:
+            int: The number of pending orders, or None in case of failure.
+        """
+        try:
+            return mt5.orders_total()
+        except Exception as e:
+            print(f"Erro ao obter as ordens: {str(e)}")
+            return None
+
+    def get_daily_realized_pnl(self):
+        """
+        Retrieves the realized result of the day from the deals that closed positions.
+
+        Returns:
+            float: Profit plus commission, swap and fees of today's closing deals, or None in case of failure.
+        """
+        now = datetime.now()
+        day_start = datetime(now.year, now.month, now.day)
+
+        try:
+            # the end is pushed forward because deal times are in the server's time zone
+            deals = mt5.history_deals_get(day_start, now + timedelta(days=1))
+            if deals is None:
+                print("Erro ao obter os negocios do dia, codigo do erro =", mt5.last_error())
+                return None
+
+            closing_entries = (mt5.DEAL_ENTRY_OUT, mt5.DEAL_ENTRY_INOUT, mt5.DEAL_ENTRY_OUT_BY)
+            return sum(deal.profit + deal.commission + deal.swap + deal.fee
+                       for deal in deals if deal.entry in closing_entries)
+
+        except Exception as e:
+            print(f"Erro ao obter o resultado do dia: {str(e)}")
+            return None
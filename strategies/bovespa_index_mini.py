@@ -1,3 +1,62 @@
+import numpy as np
+
+
+def candle_properties(open_prices, high_prices, low_prices, close_prices, doji_ratio=0.1):
+    """
+    Computes candle properties for whole OHLC columns in vectorized passes.
+
+    Patterns that compare a candle with the previous one (engulfing, inside/outside bar) are False for
+    the first candle.
+
+    Args:
+        open_prices, high_prices, low_prices, close_prices (np.ndarray): OHLC columns in time order.
+        doji_ratio (float): Maximum body / range ratio for a candle to be considered a doji.
+
+    Returns:
+        dict: Arrays with one value per candle.
+    """
+    open_prices = np.asarray(open_prices, dtype=np.float64)
+    high_prices = np.asarray(high_prices, dtype=np.float64)
+    low_prices = np.asarray(low_prices, dtype=np.float64)
+    close_prices = np.asarray(close_prices, dtype=np.float64)
+
+    body = close_prices - open_prices
+    body_size = np.abs(body)
+    candle_range = high_prices - low_prices
+    upper_wick = high_prices - np.maximum(open_prices, close_prices)
+    lower_wick = np.minimum(open_prices, close_prices) - low_prices
+    bullish = body > 0
+    bearish = body < 0
+
+    bullish_engulfing = np.zeros(len(body), dtype=bool)
+    bearish_engulfing = np.zeros(len(body), dtype=bool)
+    inside_bar = np.zeros(len(body), dtype=bool)
+    outside_bar = np.zeros(len(body), dtype=bool)
+    if len(body) > 1:
+        bullish_engulfing[1:] = (bullish[1:] & bearish[:-1] & (open_prices[1:] <= close_prices[:-1])
+                                 & (close_prices[1:] >= open_prices[:-1]))
+        bearish_engulfing[1:] = (bearish[1:] & bullish[:-1] & (open_prices[1:] >= close_prices[:-1])
+                                 & (close_prices[1:] <= open_prices[:-1]))
+        inside_bar[1:] = (high_prices[1:] <= high_prices[:-1]) & (low_prices[1:] >= low_prices[:-1])
+        outside_bar[1:] = (high_prices[1:] > high_prices[:-1]) & (low_prices[1:] < low_prices[:-1])
+
+    return {
+        'body': body,
+        'range': candle_range,
+        'upper_wick': upper_wick,
+        'lower_wick': lower_wick,
+        'bullish': bullish,
+        'bearish': bearish,
+        'doji': body_size <= doji_ratio * candle_range,
+        'hammer': (body_size > 0) & (lower_wick >= 2 * body_size) & (upper_wick <= body_size),
+        'shooting_star': (body_size > 0) & (upper_wick >= 2 * body_size) & (lower_wick <= body_size),
+        'bullish_engulfing': bullish_engulfing,
+        'bearish_engulfing': bearish_engulfing,
+        'inside_bar': inside_bar,
+        'outside_bar': outside_bar,
+    }
+
+
 class CandleStick:
     def __init__(self, open_price, high_price, low_price, close_price):
         self.open = open_price
@@ -5,21 +64,79 @@ class CandleStick:
         self.low = low_price
         self.close = close_price
 
+class CandleBuffer:
+    """
+    Fixed-capacity ring of OHLC columns preallocated as NumPy arrays.
+
+    Every value is written twice, at `i` and `i + capacity`, so the last `n` candles are always a
+    contiguous slice and windows are returned as views without copying.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.count = 0
+        self.open = np.zeros(2 * capacity)
+        self.high = np.zeros(2 * capacity)
+        self.low = np.zeros(2 * capacity)
+        self.close = np.zeros(2 * capacity)
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def append(self, open_price, high_price, low_price, close_price):
+        position = self.count % self.capacity
+        for column, value in ((self.open, open_price), (self.high, high_price), (self.low, low_price),
+                              (self.close, close_price)):
+            column[position] = value
+            column[position + self.capacity] = value
+        self.count += 1
+
+    def window(self, count=None):
+        """
+        Returns views of the last `count` candles (all stored candles if None), oldest first.
+
+        Returns:
+            tuple: open, high, low and close arrays.
+        """
+        size = len(self)
+        count = size if count is None else min(count, size)
+        end = (self.count - 1) % self.capacity + 1 + self.capacity if self.count else self.capacity
+        start = end - count
+        return self.open[start:end], self.high[start:end], self.low[start:end], self.close[start:end]
+
+
 class MiniIndiceBovespa:
-    def __init__(self):
-        self.candles = []
+    def __init__(self, max_candles=1000):
+        self.candles = CandleBuffer(max_candles)
         self.current_trade = None
         self.take_profit_price = None
         self.stop_loss_price = None
 
     def add_candle(self, candle):
-        self.candles.append(candle)
+        self.candles.append(candle.open, candle.high, candle.low, candle.close)
 
     def get_previous_candles(self, count):
-        return self.candles[-count:]
+        return [CandleStick(*ohlc) for ohlc in zip(*self.candles.window(count))]
 
     def identify_candle_properties(self, candle):
         print(f"Open: {candle.open}, High: {candle.high}, Low: {candle.low}, Close: {candle.close}")
+        properties = candle_properties([candle.open], [candle.high], [candle.low], [candle.close])
+        return {name: values[0] for name, values in properties.items()}
+
+    def latest_candle_properties(self):
+        """
+        Computes the properties of the newest candle, compared with the one before it.
+        """
+        if len(self.candles) == 0:
+            return None
+        properties = candle_properties(*self.candles.window(2))
+        return {name: values[-1] for name, values in properties.items()}
+
+    def scan_candle_properties(self, count=None):
+        """
+        Computes the properties of the last `count` stored candles (all if None) in one vectorized pass.
+        """
+        return candle_properties(*self.candles.window(count))
 
     def open_trade(self, entry_price, take_profit, stop_loss):
         self.current_trade = entry_price